@@ -1,8 +1,14 @@
+import asyncio
+import csv
+import io
 import json
 import os
 import boto3
 import datetime
 import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from botocore.exceptions import ClientError
 
 # ==============================================================================
@@ -17,10 +23,23 @@ CENTRAL_REPO_SECRET_NAME = "xxx/yyy/zzzzzzzzzzzz/wwwwwwwww"
 CENTRAL_REPO_HOST = "xxxxxxxxx.yyyyyyyyyy.us-east-1.rds.amazonaws.com"
 CENTRAL_REPO_DB = "AUDIT-TEST"
 # Table where the data will be consolidated
-CENTRAL_TABLE_NAME = "TB_Consolidated_Audit" 
+CENTRAL_TABLE_NAME = "TB_Consolidated_Audit"
+# Full loads land in the staging table and are swapped in atomically
+STAGING_TABLE_NAME = f"{CENTRAL_TABLE_NAME}_stg"
+FULL_LOAD = os.environ.get('FULL_LOAD', 'true').lower() == 'true'
 
 # Database main name
-SOURCE_DB_NAME = "dba" 
+SOURCE_DB_NAME = "dba"
+
+# Worker threads for the per-RDS fan-out (I/O bound: STS, Secrets, SELECTs)
+MAX_WORKERS = 16
+
+# Rows buffered before each flush into the central repository
+FLUSH_BATCH_SIZE = 5000
+
+# Row-batches in flight between reader threads and the writer; steady-state
+# memory is QUEUE_MAXSIZE x FLUSH_BATCH_SIZE rows regardless of table size
+QUEUE_MAXSIZE = 4
 
 TARGET_ACCOUNTS = [
     #{"Id": "xxxxxxxxxxx", "Name": "AWS Account X"},
@@ -34,6 +53,8 @@ BLACKLIST_RDS = [
     "db-2",
     "db-3",
 ]
+# Set for O(1) membership checks in the describe loop
+BLACKLIST_RDS_SET = frozenset(BLACKLIST_RDS)
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -43,12 +64,19 @@ logger.setLevel(logging.INFO)
 # ==============================================================================
 try:
     import psycopg2
-    from psycopg2.extras import RealDictCursor
+    from psycopg2.extras import execute_values
     HAS_POSTGRES = True
 except ImportError:
     HAS_POSTGRES = False
     logger.warning("psycopg2 library not found.")
 
+try:
+    import psycopg
+    HAS_PSYCOPG3 = True
+except ImportError:
+    HAS_PSYCOPG3 = False
+    logger.warning("psycopg (v3) library not found.")
+
 try:
     import pyodbc
     HAS_MSSQL = True
@@ -56,35 +84,101 @@ except ImportError:
     HAS_MSSQL = False
     logger.warning("pyodbc library not found.")
 
+try:
+    import asyncpg
+    HAS_ASYNCPG = True
+except ImportError:
+    HAS_ASYNCPG = False
+    logger.warning("asyncpg library not found.")
+
+try:
+    from aws_secretsmanager_caching import SecretCache, SecretCacheConfig
+    HAS_SECRET_CACHE = True
+except ImportError:
+    HAS_SECRET_CACHE = False
+    logger.warning("aws-secretsmanager-caching library not found.")
+
 # ==============================================================================
 #  AUX FUNCTIONS (AWS / STS / SECRETS)
 # ==============================================================================
 
+# Shared STS client and per-account credential cache; both survive warm
+# Lambda invocations. The lock only guards cache reads/writes, so role
+# assumption for different accounts runs in parallel; a rare duplicate
+# AssumeRole for the same account is harmless.
+_sts_client = None
+_role_cache = {}
+_role_cache_lock = threading.Lock()
+
 def assume_role(account_id, role_name):
-    sts_client = boto3.client("sts")
+    global _sts_client
+    now = datetime.datetime.now(datetime.timezone.utc)
+
+    with _role_cache_lock:
+        cached = _role_cache.get(account_id)
+        if cached and cached[1] - now > datetime.timedelta(minutes=5):
+            return cached[0]
+        if _sts_client is None:
+            _sts_client = boto3.client("sts")
+        sts_client = _sts_client
+
     role_arn = f"arn:aws:iam::{account_id}:role/{role_name}"
     try:
         resp = sts_client.assume_role(RoleArn=role_arn, RoleSessionName=f"SyncDB-{account_id}")
         creds = resp["Credentials"]
-        return boto3.Session(
+        session = boto3.Session(
             aws_access_key_id=creds["AccessKeyId"],
             aws_secret_access_key=creds["SecretAccessKey"],
             aws_session_token=creds["SessionToken"],
             region_name=TARGET_REGION
         )
+        with _role_cache_lock:
+            _role_cache[account_id] = (session, creds["Expiration"])
+        return session
     except Exception as e:
         logger.error(f"[ERROR] Assume Role failed on {account_id}: {e}")
         return None
 
+# Module-level cache survives warm Lambda invocations
+_secret_cache = None
+
+def _get_secret_cache(local_client):
+    global _secret_cache
+    if _secret_cache is None and HAS_SECRET_CACHE:
+        _secret_cache = SecretCache(config=SecretCacheConfig(), client=local_client)
+    return _secret_cache
+
 def get_secret_local(local_client, secret_name):
     try:
-        resp = local_client.get_secret_value(SecretId=secret_name)
-        if 'SecretString' in resp:
-            return json.loads(resp['SecretString'])
+        cache = _get_secret_cache(local_client)
+        if cache:
+            secret_string = cache.get_secret_string(secret_name)
+        else:
+            resp = local_client.get_secret_value(SecretId=secret_name)
+            secret_string = resp.get('SecretString')
+        if secret_string:
+            return json.loads(secret_string)
     except ClientError as e:
         logger.warning(f"Secret not found: {secret_name}. Erro: {e}")
     return None
 
+def prefetch_secrets(local_client, secret_names):
+    """Fetch the source secrets in bulk (20 per BatchGetSecretValue call)."""
+    secrets = {}
+    for i in range(0, len(secret_names), 20):
+        chunk = secret_names[i:i + 20]
+        try:
+            resp = local_client.batch_get_secret_value(SecretIdList=chunk)
+        except Exception as e:
+            logger.warning(f"Batch secret fetch failed, falling back to per-secret calls: {e}")
+            continue
+        for secret in resp.get('SecretValues', []):
+            if 'SecretString' in secret:
+                secrets[secret['Name']] = json.loads(secret['SecretString'])
+        for err in resp.get('Errors', []):
+            logger.warning(f"Secret not found in batch: {err.get('SecretId')}. Erro: {err.get('Message')}")
+    return secrets
+
 def json_serial(obj):
     if isinstance(obj, (datetime.datetime, datetime.date)):
         return obj.isoformat()
@@ -96,70 +190,262 @@ def json_serial(obj):
 #  MAIN REPOSITORY LOGIC (ETL - AURORA POSTGRES)
 # ==============================================================================
 
+# Persistent connection, reused across warm Lambda invocations
+_central_conn = None
+
 def get_central_connection(creds):
-    """Connecting to the main repository (Aurora PostgreSQL)"""
-    if not HAS_POSTGRES: raise Exception("Driver PostgreSQL ausente para o Central")
-    
-    return psycopg2.connect(
+    """Connecting to the main repository (Aurora PostgreSQL).
+    psycopg3 is preferred when installed (pipelined executemany, COPY via
+    cursor.copy()); psycopg2 remains the default driver otherwise."""
+    global _central_conn
+    if not HAS_POSTGRES and not HAS_PSYCOPG3:
+        raise Exception("Driver PostgreSQL ausente para o Central")
+
+    if _central_conn is not None and not _central_conn.closed:
+        return _central_conn
+
+    driver = psycopg if HAS_PSYCOPG3 else psycopg2
+    _central_conn = driver.connect(
         host=CENTRAL_REPO_HOST,
         user=creds.get('username') or creds.get('user'),
         password=creds.get('password'),
         dbname=CENTRAL_REPO_DB,
-        port=5432, 
-        connect_timeout=10
+        port=5432,
+        connect_timeout=10,
+        keepalives=1,
+        keepalives_idle=30
     )
+    return _central_conn
 
-def truncate_central_table(conn):
+def prepare_staging_table(conn):
     """
-    Cleanup the table on main repository before load data.
+    Recreate the unlogged staging table the full load writes into. It is
+    created without plain indexes — index maintenance is the dominant cost
+    of bulk INSERT/COPY; those are rebuilt from the live table's
+    definitions at publish time, so the live table stays the single source
+    of truth for index DDL. EXCLUDING INDEXES also strips PK/UNIQUE/
+    EXCLUDE constraints, so those are re-added here from the live table's
+    definitions under staging names (renamed back at publish): dropping
+    them would both disable duplicate detection during the load and lose
+    the constraints permanently at swap time. Readers keep seeing the live
+    table until the swap, and the unlogged staging table skips WAL during
+    ingest.
     """
-    logger.info(f"Cleaning up table: {CENTRAL_TABLE_NAME}...")
+    logger.info(f"Preparing staging table: {STAGING_TABLE_NAME}...")
     try:
         cursor = conn.cursor()
-        cursor.execute(f"TRUNCATE TABLE {CENTRAL_TABLE_NAME}")
+        cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE_NAME}")
+        cursor.execute(
+            f"CREATE UNLOGGED TABLE {STAGING_TABLE_NAME} "
+            f"(LIKE {CENTRAL_TABLE_NAME} INCLUDING ALL EXCLUDING INDEXES)"
+        )
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'x')",
+            (CENTRAL_TABLE_NAME.lower(),)
+        )
+        for conname, condef in cursor.fetchall():
+            cursor.execute(
+                f"ALTER TABLE {STAGING_TABLE_NAME} ADD CONSTRAINT {conname}_stg {condef}"
+            )
         conn.commit()
-        logger.info("Table cleaned up.")
+        logger.info("Staging table ready.")
     except Exception as e:
-        logger.error(f"Error on cleanup table: {e}")
+        logger.error(f"Error on preparing staging table: {e}")
         conn.rollback()
         raise e
 
-def save_batch_to_central(conn, data_rows, source_account, source_db):
-    if not data_rows:
-        return 0
+def swap_staging_table(conn):
+    """Publish the loaded staging table as the live table and rebuild the
+    live table's secondary indexes on it. Index DDL is read from the live
+    table here, never carried across runs in memory, so an earlier failed
+    load cannot lose definitions. Runs inside the caller's load
+    transaction: readers only ever see the fully loaded, fully indexed
+    result. Plain CREATE INDEX (not CONCURRENTLY) is fine because the
+    builds commit together with the swap."""
+    logger.info(f"Publishing {STAGING_TABLE_NAME} as {CENTRAL_TABLE_NAME}...")
+    old_table = f"{CENTRAL_TABLE_NAME}_old"
+    live = CENTRAL_TABLE_NAME.lower()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT indexdef FROM pg_indexes
+            WHERE tablename = %s AND indexname NOT IN (
+                SELECT conindid::regclass::text FROM pg_constraint
+                WHERE conrelid = %s::regclass AND conindid <> 0
+            )
+            """,
+            (live, live)
+        )
+        index_defs = [r[0] for r in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'x')",
+            (live,)
+        )
+        constraint_names = [r[0] for r in cursor.fetchall()]
+
+        cursor.execute(f"ALTER TABLE {STAGING_TABLE_NAME} SET LOGGED")
+        cursor.execute(f"DROP TABLE IF EXISTS {old_table}")
+        cursor.execute(f"ALTER TABLE {CENTRAL_TABLE_NAME} RENAME TO {old_table}")
+        cursor.execute(f"ALTER TABLE {STAGING_TABLE_NAME} RENAME TO {CENTRAL_TABLE_NAME}")
+        cursor.execute(f"DROP TABLE {old_table}")
+
+        # The old table is gone, so the live index and constraint names are
+        # free again; the captured DDL references the live table name, which
+        # now points at the freshly loaded table. The staging-named
+        # constraints (PK/UNIQUE/EXCLUDE, added in prepare_staging_table)
+        # get their live names back.
+        for conname in constraint_names:
+            cursor.execute(f"ALTER TABLE {CENTRAL_TABLE_NAME} RENAME CONSTRAINT {conname}_stg TO {conname}")
+        for indexdef in index_defs:
+            cursor.execute(indexdef)
+        cursor.execute(f"ANALYZE {CENTRAL_TABLE_NAME}")
+        if index_defs:
+            logger.info(f"Rebuilt {len(index_defs)} indexes on {CENTRAL_TABLE_NAME}.")
+        logger.info("Staging table published.")
+    except Exception as e:
+        logger.error(f"Error on publishing staging table: {e}")
+        raise e
+
+CENTRAL_COLUMNS = ("SourceAccount", "SourceDB", "ID", "DESCRIPTION", "STATUS", "UDATE", "INSTALLDATE")
+SOURCE_COLUMNS = ("ID", "DESCRIPTION", "STATUS", "UDATE", "INSTALLDATE")
+# NULL spelling on the CSV COPY path ('\N', the classic COPY convention)
+COPY_NULL_MARKER = '\\N'
+# Project only the persisted columns instead of SELECT *
+SOURCE_QUERY = f"SELECT {', '.join(SOURCE_COLUMNS)} FROM TEST_AUDIT"
+
+# Column layouts repeat across batches and sources, so resolved index
+# lists are cached per distinct layout
+_source_indices_cache = {}
+
+def _source_indices(columns):
+    """Case-insensitive positions of the persisted columns, resolved once
+    per distinct source layout instead of once per batch."""
+    key = tuple(columns)
+    cached = _source_indices_cache.get(key)
+    if cached is None:
+        col_idx = {name.upper(): i for i, name in enumerate(columns)}
+        cached = [col_idx.get(c) for c in SOURCE_COLUMNS]
+        _source_indices_cache[key] = cached
+    return cached
+
+def _build_copy_buffer(batch, indices, source_account, source_db):
+    """Serialize the batch once into an in-memory CSV buffer for COPY.
 
+    Cell conversion is inlined with locally-bound types: a None becomes the
+    NULL marker and date/datetime cells are rendered with isoformat upfront,
+    skipping per-cell adapter dispatch on the hot loop. QUOTE_ALL keeps
+    genuine empty strings quoted, so they load as empty strings, not NULL —
+    parity with the execute_values and asyncpg binary write paths; the
+    matching COPY options (NULL marker + FORCE_NULL) live in _write_batch.
+    """
+    buf = io.StringIO()
+    writerow = csv.writer(buf, quoting=csv.QUOTE_ALL).writerow
+    _datetime = datetime.datetime
+    _date = datetime.date
+    prefix = (source_account, source_db)
+
+    for row in batch:
+        cells = []
+        for i in indices:
+            v = row[i] if i is not None else None
+            if v is None:
+                v = COPY_NULL_MARKER
+            elif type(v) is _datetime or type(v) is _date:
+                v = v.isoformat()
+            cells.append(v)
+        writerow(prefix + tuple(cells))
+
+    buf.seek(0)
+    return buf
+
+def _save_batch_execute_values(cursor, batch, indices, source_account, source_db, table):
+    """Fallback path for cursors without COPY support (multi-row INSERT)."""
     insert_sql = f"""
-        INSERT INTO {CENTRAL_TABLE_NAME} 
-        (SourceAccount, SourceDB, ID, DESCRIPTION, STATUS, UDATE, INSTALLDATE) 
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        INSERT INTO {table}
+        (SourceAccount, SourceDB, ID, DESCRIPTION, STATUS, UDATE, INSTALLDATE)
+        VALUES %s
+    """
+    params = [
+        (source_account, source_db)
+        + tuple(row[i] if i is not None else None for i in indices)
+        for row in batch
+    ]
+    execute_values(cursor, insert_sql, params,
+                   template="(%s,%s,%s,%s,%s,%s,%s)", page_size=1000)
+    return len(params)
+
+def _save_batch_prepared(cursor, batch, indices, source_account, source_db, table):
+    """Last-resort path: a server-side prepared statement still removes the
+    per-row parse/plan cost when neither COPY nor execute_values is usable."""
+    cursor.execute(
+        f"PREPARE bulk_ins AS INSERT INTO {table} "
+        f"({', '.join(CENTRAL_COLUMNS)}) VALUES ($1,$2,$3,$4,$5,$6,$7)"
+    )
+    try:
+        params = [
+            (source_account, source_db)
+            + tuple(row[i] if i is not None else None for i in indices)
+            for row in batch
+        ]
+        cursor.executemany("EXECUTE bulk_ins (%s,%s,%s,%s,%s,%s,%s)", params)
+    finally:
+        cursor.execute("DEALLOCATE bulk_ins")
+    return len(params)
+
+def _write_batch(cursor, batch, indices, source_account, source_db, table):
+    # COPY streams the whole batch in a single round-trip. FORCE_NULL makes
+    # the quoted NULL marker read as NULL (QUOTE_ALL quotes every field),
+    # while quoted empty fields stay empty strings.
+    copy_sql = f"""
+        COPY {table}
+        ({', '.join(CENTRAL_COLUMNS)})
+        FROM STDIN WITH (FORMAT CSV, NULL '{COPY_NULL_MARKER}',
+                         FORCE_NULL ({', '.join(CENTRAL_COLUMNS)}))
     """
-    
+    if hasattr(cursor, 'copy_expert'):
+        # psycopg2
+        buf = _build_copy_buffer(batch, indices, source_account, source_db)
+        cursor.copy_expert(copy_sql, buf)
+        return len(batch)
+    if hasattr(cursor, 'copy'):
+        # psycopg3 COPY context manager
+        buf = _build_copy_buffer(batch, indices, source_account, source_db)
+        with cursor.copy(copy_sql) as copy:
+            copy.write(buf.read())
+        return len(batch)
+    if HAS_POSTGRES:
+        return _save_batch_execute_values(cursor, batch, indices, source_account, source_db, table)
+    return _save_batch_prepared(cursor, batch, indices, source_account, source_db, table)
+
+def save_batch_to_central(conn, columns, data_rows, source_account, source_db, table=CENTRAL_TABLE_NAME):
+    """Drain an iterable of raw row tuples into the central table, flushing
+    every FLUSH_BATCH_SIZE rows so memory stays bounded for streamed sources.
+    The caller owns the transaction and commits once for the whole load."""
+    if not columns:
+        return 0
+
+    indices = _source_indices(columns)
     cursor = conn.cursor()
     count = 0
     try:
-        params = []
+        batch = []
         for row in data_rows:
-            row_upper = {k.upper(): v for k, v in row.items()}
-            
-            params.append((
-                source_account,
-                source_db,
-                row_upper.get('ID'), 
-                row_upper.get('DESCRIPTION'), 
-                row_upper.get('STATUS'),
-                row_upper.get('UDATE'),
-                row_upper.get('INSTALLDATE')
-            ))
-        
-        cursor.executemany(insert_sql, params)
-        conn.commit()
-        count = len(params)
-        logger.info(f" -> Inserted {count} records in the main repository {source_db}")
+            batch.append(row)
+            if len(batch) >= FLUSH_BATCH_SIZE:
+                count += _write_batch(cursor, batch, indices, source_account, source_db, table)
+                batch = []
+        if batch:
+            count += _write_batch(cursor, batch, indices, source_account, source_db, table)
+
+        if count:
+            logger.info(f" -> Inserted {count} records in the main repository {source_db}")
     except Exception as e:
         logger.error(f"Error on saving on main repository: {e}")
-        conn.rollback()
         raise e
-    
+
     return count
 
 # ==============================================================================
@@ -167,8 +453,10 @@ def save_batch_to_central(conn, data_rows, source_account, source_db):
 # ==============================================================================
 
 def execute_mssql_full(creds, host, db_name, query):
-    if not HAS_MSSQL: return []
-    
+    """Returns (columns, row_iterator) of raw tuples, streamed in
+    fetchmany chunks; the connection closes when the iterator is drained."""
+    if not HAS_MSSQL: return None, iter(())
+
     conn_str = (
         f"DRIVER={{ODBC Driver 18 for SQL Server}};"
         f"SERVER={host},1433;"
@@ -179,20 +467,43 @@ def execute_mssql_full(creds, host, db_name, query):
     )
     try:
         conn = pyodbc.connect(conn_str)
+    except Exception as e:
+        logger.error(f"Error MSSQL Source: {e}")
+        return None, iter(())
+
+    try:
         cursor = conn.cursor()
+        cursor.arraysize = FLUSH_BATCH_SIZE
         cursor.execute(query)
-        
         columns = [column[0] for column in cursor.description]
-        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        conn.close()
-        return results
     except Exception as e:
         logger.error(f"Error MSSQL Source: {e}")
-        return []
+        conn.close()
+        return None, iter(())
+
+    def _rows():
+        # A mid-stream error must propagate: swallowing it would let the
+        # already-yielded prefix be committed as if the source had loaded
+        try:
+            while True:
+                rows = cursor.fetchmany(FLUSH_BATCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield tuple(row)
+        except Exception as e:
+            logger.error(f"Error MSSQL Source: {e}")
+            raise
+        finally:
+            conn.close()
+
+    return columns, _rows()
 
 def execute_postgres_full(creds, host, db_name, query):
-    if not HAS_POSTGRES: return []
-    
+    """Returns (columns, row_iterator) of raw tuples, streamed through a
+    server-side cursor; the connection closes when the iterator is drained."""
+    if not HAS_POSTGRES: return None, iter(())
+
     try:
         conn = psycopg2.connect(
             host=host,
@@ -202,92 +513,384 @@ def execute_postgres_full(creds, host, db_name, query):
             port=5432,
             connect_timeout=5
         )
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(query)
-            results = [dict(row) for row in cur.fetchall()]
+    except Exception as e:
+        logger.error(f"Error Postgres Source: {e}")
+        return None, iter(())
+
+    try:
+        # Named cursor = server-side; rows ship in itersize chunks. The
+        # first fetch populates cursor.description for the column layout.
+        cur = conn.cursor(name="src_cur")
+        cur.itersize = 10000
+        cur.execute(query)
+        first_rows = cur.fetchmany(cur.itersize)
+        columns = [d[0] for d in cur.description] if cur.description else None
+    except Exception as e:
+        logger.error(f"Error Postgres Source: {e}")
         conn.close()
-        return results
+        return None, iter(())
+
+    def _rows():
+        # A mid-stream error must propagate: swallowing it would let the
+        # already-yielded prefix be committed as if the source had loaded
+        try:
+            rows = first_rows
+            while rows:
+                for row in rows:
+                    yield row
+                rows = cur.fetchmany(cur.itersize)
+        except Exception as e:
+            logger.error(f"Error Postgres Source: {e}")
+            raise
+        finally:
+            conn.close()
+
+    return columns, _rows()
+
+# ==============================================================================
+#  ASYNC READERS (OPTIONAL FAST PATH - ASYNCPG)
+# ==============================================================================
+
+# Concurrent source connections on the event loop
+ASYNC_MAX_CONCURRENCY = 32
+
+async def execute_postgres_full_async(creds, host, db_name, query):
+    """asyncpg reader: returns (columns, rows) of raw tuples for one source."""
+    try:
+        conn = await asyncpg.connect(
+            host=host,
+            user=creds.get('username') or creds.get('user'),
+            password=creds.get('password'),
+            database=db_name,
+            port=5432,
+            timeout=5
+        )
     except Exception as e:
         logger.error(f"Error Postgres Source: {e}")
-        return []
+        return None, []
+
+    try:
+        rows = await conn.fetch(query)
+    except Exception as e:
+        logger.error(f"Error Postgres Source: {e}")
+        return None, []
+    finally:
+        await conn.close()
+
+    if not rows:
+        return None, []
+    return list(rows[0].keys()), [tuple(r) for r in rows]
+
+async def save_batch_to_central_async(conn, columns, rows, source_account, source_db, table):
+    """Bulk write via asyncpg's binary COPY protocol; no text serialization."""
+    if not columns or not rows:
+        return 0
+
+    indices = _source_indices(columns)
+    records = [
+        (source_account, source_db) + tuple(r[i] if i is not None else None for i in indices)
+        for r in rows
+    ]
+    await conn.copy_records_to_table(
+        table.lower(),
+        records=records,
+        columns=[c.lower() for c in CENTRAL_COLUMNS]
+    )
+    logger.info(f" -> Inserted {len(records)} records in the main repository {source_db}")
+    return len(records)
+
+def load_targets_async(targets, local_secrets_client, prefetched_secrets, central_creds, load_table):
+    """Fan out all Postgres sources on one event loop, bounded by a
+    semaphore, while the thread pool handles the remaining engines.
+
+    On full loads, completed reads are written by a single consumer straight
+    into the staging table with copy_records_to_table when an asyncpg central
+    connection is available; otherwise the rows are handed back for the
+    psycopg2 writer (inserted is None in that case). Incremental loads always
+    hand rows back: the asyncpg connection commits on its own, and a partial
+    commit into the live table would survive the load transaction's rollback
+    and duplicate on re-run."""
+
+    async def _load_one(target, sem):
+        async with sem:
+            acc_id = target['acc_id']
+            db_id = target['db_id']
+            logger.info(f" Loading data from: {db_id} ({target['engine']}) [async]")
+            secret_name = f"xxx/yyy/{acc_id}/{db_id}"
+            creds = prefetched_secrets.get(secret_name) or get_secret_local(local_secrets_client, secret_name)
+            if not creds:
+                logger.warning(f" [SKIP] No secret: {secret_name}")
+                return target, None, []
+            columns, rows = await execute_postgres_full_async(creds, target['host'], SOURCE_DB_NAME, SOURCE_QUERY)
+            return target, columns, rows
+
+    async def _main():
+        sem = asyncio.Semaphore(ASYNC_MAX_CONCURRENCY)
+
+        central = None
+        if load_table == STAGING_TABLE_NAME:
+            try:
+                central = await asyncpg.connect(
+                    host=CENTRAL_REPO_HOST,
+                    user=central_creds.get('username') or central_creds.get('user'),
+                    password=central_creds.get('password'),
+                    database=CENTRAL_REPO_DB,
+                    port=5432,
+                    timeout=10
+                )
+            except Exception as e:
+                logger.warning(f"asyncpg central connection failed, deferring writes to psycopg2: {e}")
+        else:
+            logger.info("Incremental load: asyncpg rows go through the psycopg2 transaction.")
+
+        results = []
+        try:
+            for coro in asyncio.as_completed([_load_one(t, sem) for t in targets]):
+                target, columns, rows = await coro
+                inserted = None
+                if central is not None and columns:
+                    try:
+                        inserted = await save_batch_to_central_async(
+                            central, columns, rows, target['acc_name'], target['db_id'], load_table)
+                        rows = []
+                    except Exception as e:
+                        logger.error(f"Error on saving on main repository: {e}")
+                        inserted = None
+                results.append((target, columns, rows, inserted))
+        finally:
+            if central is not None:
+                await central.close()
+        return results
+
+    return asyncio.run(_main())
 
 # ==============================================================================
 #  MAIN HANDLER
 # ==============================================================================
 
+def list_account_rds(account):
+    """Worker: assume the role into one account and list its RDS instances."""
+    acc_id = account['Id']
+    acc_name = account['Name']
+
+    target_session = assume_role(acc_id, ROLE_NAME)
+    if not target_session:
+        return []
+
+    rds_client = target_session.client('rds')
+    targets = []
+    try:
+        # Paginated describe: the plain call silently truncates at 100 DBs
+        paginator = rds_client.get_paginator('describe_db_instances')
+        for page in paginator.paginate(PaginationConfig={'PageSize': 100}):
+            for db in page['DBInstances']:
+                db_id = db['DBInstanceIdentifier']
+                host = db['Endpoint']['Address'] if 'Endpoint' in db else None
+
+                # Filter before any secret fetch is spent on the instance
+                if db_id in BLACKLIST_RDS_SET or db['DBInstanceStatus'] != 'available':
+                    continue
+
+                targets.append({
+                    "acc_id": acc_id,
+                    "acc_name": acc_name,
+                    "db_id": db_id,
+                    "engine": db['Engine'],
+                    "host": host
+                })
+    except Exception as e:
+        logger.error(f"Error listing RDS in the account {acc_id}: {e}")
+        return []
+    return targets
+
+def load_one_rds(target, local_secrets_client, prefetched_secrets):
+    """Worker: look up the source secret and read the full table from one RDS."""
+    acc_id = target['acc_id']
+    db_id = target['db_id']
+    engine = target['engine']
+
+    logger.info(f" Loading data from: {db_id} ({engine})")
+    secret_name = f"xxx/yyy/{acc_id}/{db_id}"
+    # Prefetched via BatchGetSecretValue; individual fetch as fallback
+    creds = prefetched_secrets.get(secret_name) or get_secret_local(local_secrets_client, secret_name)
+
+    if not creds:
+        logger.warning(f" [SKIP] No secret: {secret_name}")
+        return target, None, iter(())
+
+    if "sqlserver" in engine:
+        columns, rows = execute_mssql_full(creds, target['host'], SOURCE_DB_NAME, SOURCE_QUERY)
+    elif "postgres" in engine:
+        columns, rows = execute_postgres_full(creds, target['host'], SOURCE_DB_NAME, SOURCE_QUERY)
+    else:
+        columns, rows = None, iter(())
+    return target, columns, rows
+
+# Marks one reader future as finished on the batch queue
+_QUEUE_DONE = object()
+
+def load_one_rds_to_queue(target, local_secrets_client, prefetched_secrets, batch_queue):
+    """Worker: drain one RDS and enqueue FLUSH_BATCH_SIZE row-batches.
+    The bounded queue provides backpressure, so the reader stalls instead
+    of buffering a whole table when the writer falls behind.
+
+    The _QUEUE_DONE sentinel is always put from this worker thread, in the
+    finally below. Pushing it from a future callback is not safe: for an
+    already-finished future, add_done_callback runs the callback inline in
+    the main thread, and a blocking put on a full queue would deadlock the
+    only consumer."""
+    try:
+        target, columns, rows = load_one_rds(target, local_secrets_client, prefetched_secrets)
+
+        produced = False
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= FLUSH_BATCH_SIZE:
+                batch_queue.put((target, columns, batch))
+                batch = []
+                produced = True
+        if batch:
+            batch_queue.put((target, columns, batch))
+            produced = True
+        if not produced:
+            # Empty marker so the writer can still report the source
+            batch_queue.put((target, None, []))
+    finally:
+        batch_queue.put(_QUEUE_DONE)
+
 def lambda_handler(event, context):
     logger.info("--- STARTING LOAD DATA (FULL LOAD) ---")
-    
+
     local_secrets_client = boto3.client('secretsmanager', region_name=TARGET_REGION)
-    
+
     # 1. Connecting to the main repository (Aurora)
     central_creds = get_secret_local(local_secrets_client, CENTRAL_REPO_SECRET_NAME)
     if not central_creds:
         return {'statusCode': 500, 'body': "Error: No main repository credentials found."}
-    
+
     try:
         central_conn = get_central_connection(central_creds)
-        
-        # 2. TABLE CLEANUP (FULL LOAD REQUIREMENT)
-        truncate_central_table(central_conn)
-        
+        central_conn.autocommit = False
+
+        # 2. FULL LOAD writes into the staging table, published at the end;
+        # incremental runs append to the live table directly
+        if FULL_LOAD:
+            prepare_staging_table(central_conn)
+            load_table = STAGING_TABLE_NAME
+        else:
+            load_table = CENTRAL_TABLE_NAME
+
     except Exception as e:
-        return {'statusCode': 500, 'body': f"Fatal error on connecting/cleaning up: {e}"}
+        return {'statusCode': 500, 'body': f"Fatal error on connecting/preparing staging: {e}"}
 
     total_synced = 0
     report = []
 
-    for account in TARGET_ACCOUNTS:
-        acc_id = account['Id']
-        acc_name = account['Name']
-        
-        target_session = assume_role(acc_id, ROLE_NAME)
-        if not target_session: continue 
-            
-        rds_client = target_session.client('rds')
-        
-        try:
-            dbs = rds_client.describe_db_instances()
-        except Exception as e:
-            logger.error(f"Error listing RDS in the account {acc_id}: {e}")
-            continue
+    try:
+        # One transaction covers every batch insert, the index rebuild and the
+        # swap; a single commit at the end amortizes the WAL flush round-trips.
+        # Full loads only: synchronous_commit=off lets that commit return
+        # before the WAL flush, and a failed full load is simply re-run.
+        # Incremental appends must be durable before we report success.
+        if FULL_LOAD:
+            central_conn.cursor().execute("SET LOCAL synchronous_commit = off")
 
-        for db in dbs['DBInstances']:
-            db_id = db['DBInstanceIdentifier']
-            engine = db['Engine']
-            host = db['Endpoint']['Address'] if 'Endpoint' in db else None
-            
-            if db_id in BLACKLIST_RDS or db['DBInstanceStatus'] != 'available':
-                continue
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            # 3. One AssumeRole + describe per account, in parallel
+            targets = []
+            for account_targets in executor.map(list_account_rds, TARGET_ACCOUNTS):
+                targets.extend(account_targets)
 
-            logger.info(f" Loading data from: {db_id} ({engine})")
-            secret_name = f"xxx/yyy/{acc_id}/{db_id}"
-            creds = get_secret_local(local_secrets_client, secret_name)
-            
-            if not creds:
-                logger.warning(f" [SKIP] No secret: {secret_name}")
-                continue
-
-            full_data = []
-            
-            query_all = "SELECT * FROM TEST_AUDIT" 
-            
-            if "sqlserver" in engine:
-                full_data = execute_mssql_full(creds, host, SOURCE_DB_NAME, query_all)
-                
-            elif "postgres" in engine:
-                full_data = execute_postgres_full(creds, host, SOURCE_DB_NAME, query_all)
-
-            if full_data:
-                logger.info(f"   -> Found {len(full_data)} records.")
-                inserted = save_batch_to_central(central_conn, full_data, acc_name, db_id)
-                total_synced += inserted
-                report.append(f"{db_id}: {inserted} records loaded")
+            # 4. One batched Secrets Manager call instead of one per RDS
+            secret_names = [f"xxx/yyy/{t['acc_id']}/{t['db_id']}" for t in targets]
+            prefetched_secrets = prefetch_secrets(local_secrets_client, secret_names)
+
+            # 5. Fan out the per-RDS reads; only this main thread touches central_conn.
+            # Postgres sources go through asyncpg when available, other engines
+            # stay on the thread pool.
+            if HAS_ASYNCPG:
+                async_targets = [t for t in targets if "postgres" in t['engine']]
+                pool_targets = [t for t in targets if "postgres" not in t['engine']]
             else:
-                logger.info("   -> No data found.")
+                async_targets, pool_targets = [], targets
+
+            batch_queue = queue.Queue(maxsize=QUEUE_MAXSIZE)
+            futures = [executor.submit(load_one_rds_to_queue, t, local_secrets_client,
+                                       prefetched_secrets, batch_queue)
+                       for t in pool_targets]
+
+            # Any failure from here on must not escape before the queue is
+            # drained: readers blocked on a full queue would never exit and
+            # the executor shutdown would hang the Lambda with the
+            # transaction open. Errors are captured, the drain runs to
+            # completion, and the error is re-raised afterwards.
+            per_db = {}
+            write_error = None
+
+            try:
+                if async_targets:
+                    for target, columns, rows, inserted in load_targets_async(
+                            async_targets, local_secrets_client, prefetched_secrets, central_creds, load_table):
+                        if inserted is None:
+                            # asyncpg write path unavailable; fall back to psycopg2
+                            inserted = save_batch_to_central(central_conn, columns, rows, target['acc_name'], target['db_id'], load_table)
+                        if inserted:
+                            total_synced += inserted
+                            report.append(f"{target['db_id']}: {inserted} records loaded")
+                        else:
+                            logger.info("   -> No data found.")
+            except Exception as e:
+                write_error = e
+
+            # Single writer: drain batches as readers produce them. Batches
+            # from different sources interleave, so counts aggregate per DB.
+            remaining = len(futures)
+            while remaining:
+                item = batch_queue.get()
+                if item is _QUEUE_DONE:
+                    remaining -= 1
+                    continue
+                if write_error is not None:
+                    continue  # keep draining so blocked readers can finish
+                target, columns, batch = item
+                db_id = target['db_id']
+                per_db.setdefault(db_id, 0)
+                try:
+                    per_db[db_id] += save_batch_to_central(
+                        central_conn, columns, batch, target['acc_name'], db_id, load_table)
+                except Exception as e:
+                    write_error = e
+            if write_error is not None:
+                raise write_error
+
+            # A reader that died mid-stream may already have batches inside
+            # the transaction; fail the load rather than publish the prefix.
+            # Unreachable sources never raise here — they return no rows.
+            for f in futures:
+                if f.exception():
+                    raise f.exception()
+
+            for db_id, inserted in per_db.items():
+                if inserted:
+                    total_synced += inserted
+                    report.append(f"{db_id}: {inserted} records loaded")
+                else:
+                    logger.info("   -> No data found.")
+
+        # 6. Publish the staging table; readers never see a partial load
+        if FULL_LOAD:
+            swap_staging_table(central_conn)
+
+        # Single commit for the whole load
+        central_conn.commit()
+    except Exception as e:
+        logger.error(f"Load failed, rolling back: {e}")
+        central_conn.rollback()
+        return {'statusCode': 500, 'body': f"Fatal error during load: {e}"}
+
+    # Connection stays open for reuse by the next warm invocation
 
-    central_conn.close()
-    
     return {
         'statusCode': 200,
         'body': json.dumps({"status": "Success (Full Load)", "total_records": total_synced, "details": report})